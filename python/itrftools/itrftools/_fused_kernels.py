@@ -0,0 +1,52 @@
+#! /usr/bin/python
+
+""" Fused (numba) kernels for the two-term parametric models, used by
+    parametric.md_logexp_vec() and parametric.md_expexp_vec(). The kernels
+    are compiled when this module is imported, so it is only imported (by the
+    functions above) when needed, and only if numba is available.
+"""
+
+import math
+from numba import njit, prange
+from itrftools.parametric import _FASTMATH
+
+## Fused (single pass) kernels for the two-term models; the *_s flavours take
+## scalar model parameters, the rest one parameter per element. Relaxation
+## times are passed in as reciprocals, so that the loops only multiply (and
+## can be vectorized). The kernels are compiled (for float64 and float32
+## arrays) when the module is loaded, and cached on disk; all input arrays
+## are passed in as read-only, contiguous 1-D arrays.
+
+_RO = 'Array({0}, 1, "C", readonly=True)'
+_KERNEL_SIGS = ['void({0},{0},{0},{0},{0},{1}[::1])'.format(_RO.format(t), t)
+                for t in ('f8', 'f4')]
+_KERNEL_S_SIGS = ['void({0},{1},{1},{1},{1},{1}[::1])'.format(_RO.format(t), t)
+                  for t in ('f8', 'f4')]
+
+@njit(_KERNEL_SIGS, fastmath=_FASTMATH, parallel=True, cache=True,
+      boundscheck=False)
+def logexp_kernel(dtq, a1, inv_t1, a2, inv_t2, out):
+  for i in prange(dtq.shape[0]):
+    d = dtq[i]
+    out[i] = a1[i]*math.log1p(d*inv_t1[i]) - a2[i]*math.expm1(-d*inv_t2[i])
+
+@njit(_KERNEL_S_SIGS, fastmath=_FASTMATH, parallel=True, cache=True,
+      boundscheck=False)
+def logexp_kernel_s(dtq, a1, inv_t1, a2, inv_t2, out):
+  for i in prange(dtq.shape[0]):
+    d = dtq[i]
+    out[i] = a1*math.log1p(d*inv_t1) - a2*math.expm1(-d*inv_t2)
+
+@njit(_KERNEL_SIGS, fastmath=_FASTMATH, parallel=True, cache=True,
+      boundscheck=False)
+def expexp_kernel(dtq, a1, inv_t1, a2, inv_t2, out):
+  for i in prange(dtq.shape[0]):
+    d = dtq[i]
+    out[i] = -a1[i]*math.expm1(-d*inv_t1[i]) - a2[i]*math.expm1(-d*inv_t2[i])
+
+@njit(_KERNEL_S_SIGS, fastmath=_FASTMATH, parallel=True, cache=True,
+      boundscheck=False)
+def expexp_kernel_s(dtq, a1, inv_t1, a2, inv_t2, out):
+  for i in prange(dtq.shape[0]):
+    d = dtq[i]
+    out[i] = -a1*math.expm1(-d*inv_t1) - a2*math.expm1(-d*inv_t2)
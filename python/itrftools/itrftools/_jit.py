@@ -0,0 +1,33 @@
+#! /usr/bin/python
+
+""" Optional Numba support.
+    numba (http://numba.pydata.org/) is only imported when it is first
+    needed, so that importing the package (and using its scalar functions)
+    does not load numba (or numpy); use have_numba() to check whether it is
+    available. njit() is numba's own if numba is available, else a no-op
+    decorator; since calling it imports numba, it should only be called
+    from within the array/batch functions, not at module level. Modules
+    holding numba kernels (_kernels, _fused_kernels) import numba directly
+    and are only imported if have_numba() is True.
+"""
+
+_HAVE_NUMBA = None
+
+def have_numba():
+  """ True if numba can be imported; the first call imports it. """
+  global _HAVE_NUMBA
+  if _HAVE_NUMBA is None:
+    try:
+      import numba
+      _HAVE_NUMBA = True
+    except ImportError:
+      _HAVE_NUMBA = False
+  return _HAVE_NUMBA
+
+def njit(*args, **kwargs):
+  if have_numba():
+    import numba
+    return numba.njit(*args, **kwargs)
+  if len(args) == 1 and callable(args[0]) and not kwargs:
+    return args[0]
+  return lambda func: func
@@ -0,0 +1,45 @@
+#! /usr/bin/python
+
+""" Numba kernels used by the batch (array) functions of compute_psd and
+    geodesy; this module is only imported (by those functions) when needed,
+    and only if numba is available.
+"""
+
+from numba import njit, prange
+from itrftools import parametric, geodesy
+
+## geodesy.xyz2llh(), compiled
+xyz2llh = njit(cache=True, fastmath=True)(geodesy.xyz2llh)
+
+@njit(parallel=True, cache=True, fastmath=True)
+def xyz2llh_kernel(x, y, z, lat, lon, hgt):
+  for i in prange(x.shape[0]):
+    lat[i], lon[i], hgt[i] = xyz2llh(x[i], y[i], z[i])
+
+## parametric.md_any(), compiled
+md_any = njit('f8(i8,f8,f8,f8,f8,f8)', cache=True,
+              boundscheck=False)(parametric.md_any)
+
+@njit(parallel=True, cache=True)
+def psd_table_kernel(dyr, me, a1e, it1e, a2e, it2e, mn, a1n, it1n, a2n, it2n,
+                     mu, a1u, it1u, a2u, it2u, de, dn, du):
+  for i in prange(dyr.shape[0]):
+    d = dyr[i]
+    de[i] = md_any(me[i], d, a1e[i], it1e[i], a2e[i], it2e[i])
+    dn[i] = md_any(mn[i], d, a1n[i], it1n[i], a2n[i], it2n[i])
+    du[i] = md_any(mu[i], d, a1u[i], it1u[i], a2u[i], it2u[i])
+
+@njit(parallel=True, cache=True)
+def multi_model_kernel(ids, dtq, a1, inv_t1, a2, inv_t2, block, out):
+  n = dtq.shape[0]
+  for b in prange((n + block - 1) // block):
+    start = b*block
+    stop = min(start + block, n)
+    for i in range(ids.shape[0]):
+      for j in range(start, stop):
+        out[i, j] = md_any(ids[i], dtq[j], a1[i], inv_t1[i], a2[i], inv_t2[i])
+
+@njit(parallel=True, cache=True)
+def md_any_kernel(model, dtq, a1, inv_t1, a2, inv_t2, out):
+  for i in prange(dtq.shape[0]):
+    out[i] = md_any(model, dtq[i], a1, inv_t1, a2, inv_t2)
@@ -1,8 +1,16 @@
 #! /usr/bin/python
 
-import sys, datetime, math
-import numpy as np
+import sys, os, datetime, math, calendar, mmap
+from collections import namedtuple
 from itrftools import parametric
+from itrftools.geodesy import xyz2llh, xyz2llh_vec
+from itrftools._jit import have_numba
+
+## Current year; used to resolve 2-digit years (YY) to 4-digit ones
+_NOW_YEAR = datetime.datetime.now().year
+
+## Seconds to (fractional) years; a year here is 365.25 days
+_INV_YR_SEC = 1e0/(365.25e0*86400e0)
 
 
 def time_str2dt(time_str):
@@ -20,11 +28,50 @@ def time_str2dt(time_str):
                  A datetime instance
   """
   cyr, doy, isec = map(int, time_str.split(':'))
-  yr = cyr+2000 if datetime.datetime.now().year > cyr+2000 else cyr+1900
+  yr = cyr+2000 if _NOW_YEAR > cyr+2000 else cyr+1900
   dt = (datetime.datetime(yr, 1, 1) + datetime.timedelta(doy-1)
       + datetime.timedelta(seconds=isec))
   return dt
 
+def _days_from_civil(y, m, d):
+  """ Number of days from 1970-01-01 to the (proleptic Gregorian) date y-m-d.
+      Reference: H. Hinnant, chrono-Compatible Low-Level Date Algorithms,
+      http://howardhinnant.github.io/date_algorithms.html#days_from_civil
+  """
+  if m <= 2: y -= 1
+  era = y // 400
+  yoe = y - era*400
+  doy = (153*(m-3 if m > 2 else m+9) + 2)//5 + d-1
+  doe = yoe*365 + yoe//4 - yoe//100 + doy
+  return era*146097 + doe - 719468
+
+def time_str2dt_epoch(time_str):
+  """ Resolve a datetime string of type: YY:DDD:SSSSS to seconds since
+      1970-01-01 00:00:00; this is the same as time_str2dt() but avoids the
+      construction of any datetime instance.
+
+      Parameters:
+      -------------------
+      time_str : string
+                 A datetime string of type YY:DDD:SSSSS, e.g. '09:280:80331'
+
+      Returns
+      -------------------
+      int
+                 Seconds since 1970-01-01 00:00:00
+  """
+  cyr  = int(time_str[0:2])
+  doy  = int(time_str[3:6])
+  isec = int(time_str[7:12])
+  yr = cyr+2000 if _NOW_YEAR > cyr+2000 else cyr+1900
+  return (_days_from_civil(yr, 1, 1) + doy-1)*86400 + isec
+
+def dt2epoch(t):
+  """ Seconds since 1970-01-01 00:00:00 of a (naive) datetime.datetime
+      instance t; any fractional seconds are ignored.
+  """
+  return calendar.timegm(t.timetuple())
+
 def get_psd_model(line, cmp):
   """ This function extracts the PSD model and parameters off from a line 
       of a ITRF-psd-*.dat file.
@@ -34,9 +81,11 @@ def get_psd_model(line, cmp):
                                      N 3   61.57  2.1357   26.26  0.2294
                                      U 4  157.62  3.3132   25.61  0.1854
       +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-      The function disregards everything before column 32 and after column 72
+      The function disregards everything before column 32 and after column 68
       (hence the technique is not read). We are onlu interested in the
-      component, model type (int) and model parameters.
+      component, model type (int) and model parameters. Parameters are read
+      off from fixed 8-char wide columns, i.e. a1 at [36:44], t1 at [44:52],
+      a2 at [52:60] and t2 at [60:68].
 
       Parameters:
       ----------------
@@ -51,16 +100,25 @@ def get_psd_model(line, cmp):
       ----------------
       tuple
           A 2-element tuple where the first element is an int [0,4] describing
-          the model type and the second element is a list containing the model
+          the model type and the second element is a tuple containing the model
           parameters; this second element has variable size depending on the
-          model type.
+          model type (0 for model 0, 2 for models 1 and 2, 4 for models 3 and
+          4).
 
   """
   assert( line[32] == cmp )
   model  = int(line[34])
   assert( model >= 0 and model < 5 )
-  params = map(float, line[36:72].split())
-  return model, params
+  if not model:
+    return model, ()
+  if model < 3:
+    return model, (float(line[36:44]), float(line[44:52]))
+  return model, (float(line[36:44]), float(line[44:52]),
+                 float(line[52:60]), float(line[60:68]))
+
+## A PSD (station/earthquake) record, as returned by get_psd_record(); this is
+## a tuple, so it can still be unpacked as sta, domes, t0, me, pe, ...
+PsdRecord = namedtuple('PsdRecord', 'sta domes t0 me pe mn pn mu pu t0_sec')
 
 def get_next_psd(fin, line):
   """ This function extracts the PSD model and parameters for a station, off
@@ -87,23 +145,70 @@ def get_next_psd(fin, line):
           [1] : (string) Station domes number
           [2] : (datetime.datetime) Datatime (instance) of the earthquake
           [3] : (int) Model id for the PSD of the East component
-          [4] : (list of floats) Parameters for the PSD of the East component
+          [4] : (tuple of floats) Parameters for the PSD of the East component
           [5] : (int) Model id for the PSD of the North component
-          [6] : (list of floats) Parameters for the PSD of the North component
+          [6] : (tuple of floats) Parameters for the PSD of the North component
           [7] : (int) Model id for the PSD of the Up component
-          [8] : (list of floats) Parameters for the PSD of the Up component
+          [8] : (tuple of floats) Parameters for the PSD of the Up component
+          [9] : (int) Epoch of the earthquake in seconds since 1970-01-01
+                00:00:00 (see time_str2dt_epoch())
 
   """
-  sta_name = line[1:5]
-  char_id  = line[7]
-  domes    = line[9:18]
-  dtime    = time_str2dt(line[19:31])
-  modele, parame = get_psd_model(line, 'E')
-  line = fin.readline()
-  modeln, paramn = get_psd_model(line, 'N')
-  line = fin.readline()
-  modelu, paramu = get_psd_model(line, 'U')
-  return sta_name, domes, dtime, modele, parame, modeln, paramn, modelu, paramu
+  return get_psd_record(line, fin.readline(), fin.readline())
+
+def get_psd_record(line_e, line_n, line_u):
+  """ This function extracts the PSD model and parameters for a station, off
+      from the three lines of an ITRF-psd-*.dat station record (i.e. the
+      lines for the East, North and Up components). It is the same as
+      get_next_psd(), only all lines are passed in (instead of reading them
+      off from a file stream).
+
+      Returns:
+      ----------------
+      PsdRecord
+          A (named) tuple with the same elements as get_next_psd() returns
+  """
+  sta_name = line_e[1:5]
+  domes    = line_e[9:18]
+  dtime    = time_str2dt(line_e[19:31])
+  modele, parame = get_psd_model(line_e, 'E')
+  modeln, paramn = get_psd_model(line_n, 'N')
+  modelu, paramu = get_psd_model(line_u, 'U')
+  return PsdRecord(sta_name, domes, dtime, modele, parame, modeln, paramn,
+                   modelu, paramu, time_str2dt_epoch(line_e[19:31]))
+
+def read_text(filename):
+  """ Read a whole (text) file and return its content as a string. The file
+      is memory-mapped (read-only), so that its content is served straight
+      off from the OS page cache.
+  """
+  with open(filename, 'rb') as fin:
+    try:
+      mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError: # cannot map an empty file
+      return ''
+    try:
+      return mm[:].decode('latin-1')
+    finally:
+      mm.close()
+
+def read_psd_lines(psd_file):
+  """ Read a whole PSD file in one go (see read_text()) and return its lines
+      (as a list of strings, without the trailing newline characters).
+  """
+  return read_text(psd_file).splitlines()
+
+def iter_psd(psd_file):
+  """ Generator yielding all records of a PSD file (each as returned by
+      get_psd_record()), in file order. Blank lines are skipped; a file whose
+      (non-blank) lines are not a multiple of three (i.e. ending with an
+      incomplete record) raises a ValueError.
+  """
+  lines = [ line for line in read_psd_lines(psd_file) if line.strip() ]
+  if len(lines) % 3:
+    raise ValueError('Incomplete station record in PSD file {}'.format(psd_file))
+  for i in range(0, len(lines), 3):
+    yield get_psd_record(lines[i], lines[i+1], lines[i+2])
 
 def compute_psd(psd_file, t=datetime.datetime.now(), station=None, domes=None):
   """ Given an (ITRF) .PSD file, aka a file containing ITRF-like post seismic
@@ -137,88 +242,277 @@ def compute_psd(psd_file, t=datetime.datetime.now(), station=None, domes=None):
       -----
       To specify the station, you must use either the 'station' parameter, or
       the 'domes' parameter, but **not** both.
+      The PSD file is parsed (see build_psd_index()) on the first call only;
+      subsequent calls for the same (unmodified) file reuse the parsed
+      records.
   """
-  de = dn = du = 0e0
-  num_of_psd   = 0
   sta_def      = ' '*4 if not station else station
   dms_def      = ' '*9 if not domes else domes
-  found        = False
   assert(not station or not domes)
-  if station: station = station.upper()
-  with open(psd_file) as fin:
-    line = fin.readline()
-    while line:
-      sta, dms, et, me, pe, mn, pn, mu, pu = get_next_psd(fin, line)
-      if (not station and domes == dms) or (not domes and station == sta):
-        dt  = t - et
-        dyr = (dt.days + dt.seconds/86400e0)/365.25
-        de += parametric.parametric(me, dyr, *pe)
-        dn += parametric.parametric(mn, dyr, *pn)
-        du += parametric.parametric(mu, dyr, *pu)
-        num_of_psd += 1
-        found   = True
-        sta_def = sta
-        dms_def = dms
-      line = fin.readline()
-    # print 'Number of individuals PSDs applied: {}'.format(num_of_psd)
-    return sta_def, dms_def, de, dn, du
-
-def xyz2llh(x, y, z, a=6378137e0, f=0.003352810681183637418):
-  """ Cartesian to ellispoidal coordinates, based on
-      Transformation from Cartesian to geodetic coordinates accelerated by 
-      Halley's method, J. Geodesy (2006), 79(12): 689-693
+  sta_index, dms_index = _cached_psd_index(psd_file)
+  if station:
+    records = sta_index.get(station.upper(), [])
+  else:
+    records = dms_index.get(domes, [])
+  de, dn, du = psd_from_records(records, t)
+  if records: sta_def, dms_def = records[-1].sta, records[-1].domes
+  return sta_def, dms_def, de, dn, du
+
+def build_psd_index(psd_file):
+  """ Parse a whole PSD file once and index its records per station, so that
+      the PSD records of any station can be retrieved without re-reading the
+      file.
+
+      Parameters:
+      -----------
+      psd_file: string
+          The PSD (.dat) file to read (see e.g.
+          ftp://itrf.ign.fr/pub/itrf/itrf2014/ITRF2014-psd-gnss.dat
+
+      Returns:
+      --------
+      tuple (of size 2)
+          Two dictionaries; the first maps (upper-case) station names (4-char
+          ids) and the second DOMES numbers, to the list of PSD records (as
+          returned by get_psd_record()) of the respective station, in file
+          order.
+          To get the records for a station use e.g.
+          sta_index.get(station.upper(), []); this way only the earthquakes
+          affecting the station are visited.
   """
-  # Functions of ellipsoid parameters.
-  aeps2 = a*a*1e-32
-  e2    = (2.0e0-f)*f
-  e4t   = e2*e2*1.5e0
-  ep2   = 1.0e0-e2
-  ep    = math.sqrt(ep2)
-  aep   = a*ep
-  # Compute Coefficients of (Modified) Quartic Equation
-  # Remark: Coefficients are rescaled by dividing by 'a'
-  # Compute distance from polar axis squared.
-  p2 = x*x + y*y
-  # Compute longitude lambda.
-  if p2:
-    lon = math.atan2(y, x)
+  sta_index = {}
+  dms_index = {}
+  for record in iter_psd(psd_file):
+    sta_index.setdefault(record.sta.upper(), []).append(record)
+    dms_index.setdefault(record.domes, []).append(record)
+  return sta_index, dms_index
+
+## Indexes of the PSD files used by compute_psd(), keyed by (absolute) file
+## name; each value is the tuple (modification time, index), so that a file
+## modified since it was indexed is parsed again
+_PSD_INDEX_CACHE = {}
+
+def _cached_psd_index(psd_file):
+  """ build_psd_index(psd_file), memoised per file and modification time """
+  key = os.path.abspath(psd_file)
+  mtime = os.path.getmtime(psd_file)
+  entry = _PSD_INDEX_CACHE.get(key)
+  if entry is None or entry[0] != mtime:
+    entry = _PSD_INDEX_CACHE[key] = (mtime, build_psd_index(psd_file))
+  return entry[1]
+
+def psd_from_records(records, t=datetime.datetime.now()):
+  """ Compute the (total) PSD correction per [e,n,u] component at a given
+      time t, off from a list of PSD records (e.g. the records of a station,
+      as indexed by build_psd_index()).
+
+      Parameters:
+      -----------
+      records: list of tuples
+          The PSD records, each as returned by get_psd_record()
+      t: datetime.datetime
+          The time we want the PSD at.
+
+      Returns:
+      --------
+      tuple (of size 3)
+          The (total) PSD in [e,n,u] components respectively in mm.
+          Records of earthquakes after t contribute nothing (there is no
+          post-seismic deformation before the event).
+  """
+  de = dn = du = 0e0
+  models = parametric.MODELS
+  t_sec  = dt2epoch(t)
+  for rec in records:
+    if t_sec < rec.t0_sec: continue
+    dyr = (t_sec - rec.t0_sec)*_INV_YR_SEC
+    de += models[rec.me](dyr, *rec.pe)
+    dn += models[rec.mn](dyr, *rec.pn)
+    du += models[rec.mu](dyr, *rec.pu)
+  return de, dn, du
+
+## Keys (i.e. columns) of a PSD table, as returned by load_psd_table()
+_PSD_TABLE_KEYS = ('sta', 'domes', 't0_sec', 'me', 'mn', 'mu',
+                   'a1e', 'it1e', 'a2e', 'it2e',
+                   'a1n', 'it1n', 'a2n', 'it2n',
+                   'a1u', 'it1u', 'a2u', 'it2u')
+
+def load_psd_table(psd_file, cache_file=None):
+  """ Parse a whole (ITRF) .PSD file in one go and return its contents as a
+      table of (column) arrays, i.e. one numpy array per field, where element
+      i of every array refers to the i-th earthquake record in the file.
+
+      Parameters:
+      -----------
+      psd_file: string
+          The PSD (.dat) file to read (see e.g.
+          ftp://itrf.ign.fr/pub/itrf/itrf2014/ITRF2014-psd-gnss.dat
+      cache_file: string
+          If given, the parsed table is stored to (and on subsequent calls
+          loaded from) this .npz file; the '.npz' extension is appended if
+          missing (as numpy.savez does). The cache is only used if it was
+          built off from a PSD file with the same modification time as
+          psd_file; a cache file that cannot be read is ignored (and
+          rewritten).
+
+      Returns:
+      --------
+      dictionary
+          A dictionary of numpy arrays, with keys:
+          'sta'   : (str) station name (4-char id)
+          'domes' : (str) station domes number
+          't0_sec': (int64) epoch of the earthquake in seconds since
+                    1970-01-01 00:00:00
+          'me', 'mn', 'mu' : (int) model id for the East, North and Up
+                    component respectively
+          'a1e', 'it1e', 'a2e', 'it2e' : (float) model parameters for the
+                    East component, i.e. the amplitudes a1, a2 and the
+                    reciprocals of the relaxation times, 1/t1 and 1/t2 (so
+                    that evaluating the models needs no divisions);
+                    parameters not used by the model are set to 0
+          'a1n', 'it1n', 'a2n', 'it2n' : same for the North component
+          'a1u', 'it1u', 'a2u', 'it2u' : same for the Up component
+  """
+  import numpy as np
+  mtime = os.path.getmtime(psd_file)
+  if cache_file and not cache_file.endswith('.npz'): cache_file += '.npz'
+  if cache_file and os.path.isfile(cache_file):
+    try:
+      with np.load(cache_file) as npz:
+        if (npz['mtime'] == mtime
+            and sorted(npz.files) == sorted(_PSD_TABLE_KEYS + ('mtime',))):
+          return dict((key, npz[key]) for key in npz.files if key != 'mtime')
+    except Exception: # corrupt/truncated cache; treat it as a miss
+      pass
+  cols = dict((key, []) for key in _PSD_TABLE_KEYS)
+  for rec in iter_psd(psd_file):
+    cols['sta'].append(rec.sta)
+    cols['domes'].append(rec.domes)
+    cols['t0_sec'].append(rec.t0_sec)
+    for c, model, params in zip('enu', (rec.me, rec.mn, rec.mu),
+                                (rec.pe, rec.pn, rec.pu)):
+      a1, t1, a2, t2 = list(params) + [0e0]*(4-len(params))
+      cols['m'+c].append(model)
+      cols['a1'+c].append(a1)
+      cols['it1'+c].append(1e0/t1 if t1 else 0e0)
+      cols['a2'+c].append(a2)
+      cols['it2'+c].append(1e0/t2 if t2 else 0e0)
+  table = {'sta': np.array(cols['sta'], dtype='U4'),
+           'domes': np.array(cols['domes'], dtype='U9'),
+           't0_sec': np.array(cols['t0_sec'], dtype=np.int64)}
+  for key in _PSD_TABLE_KEYS[3:]:
+    table[key] = np.array(cols[key],
+                          dtype=np.int8 if key[0] == 'm' else np.float64)
+  if cache_file:
+    try:
+      np.savez(cache_file, mtime=mtime, **table)
+    except (IOError, OSError):
+      pass
+  return table
+
+def psd_model_batch(model, dyr, a1, inv_t1, a2, inv_t2):
+  """ Vectorized version of parametric.parametric(); evaluate the PSD models
+      for arrays of records at once. All arguments are arrays of the same
+      size; model holds the (int) model id of each record, dyr the time
+      difference (t-t_Earthquake) in decimal years and a1, inv_t1, a2,
+      inv_t2 the model parameters, with the relaxation times given as
+      reciprocals (i.e. 1/t1 and 1/t2).
+
+      Returns:
+      --------
+      numpy.ndarray
+          The post-seismic correction (in mm) of each record.
+  """
+  import numpy as np
+  out = np.zeros(dyr.shape)
+  sel = (model == 1)
+  out[sel] = a1[sel]*np.log1p(dyr[sel]*inv_t1[sel])
+  sel = (model == 2)
+  out[sel] = -a1[sel]*np.expm1(-dyr[sel]*inv_t1[sel])
+  sel = (model == 3)
+  out[sel] = (a1[sel]*np.log1p(dyr[sel]*inv_t1[sel])
+              - a2[sel]*np.expm1(-dyr[sel]*inv_t2[sel]))
+  sel = (model == 4)
+  out[sel] = (-a1[sel]*np.expm1(-dyr[sel]*inv_t1[sel])
+              - a2[sel]*np.expm1(-dyr[sel]*inv_t2[sel]))
+  return out
+
+def index_psd_table(table):
+  """ Index the rows of a PSD table (as returned by load_psd_table()) per
+      station.
+
+      Returns:
+      --------
+      dictionary
+          Maps each (upper-case) station name (4-char id) to a numpy array
+          holding the indexes of the station's rows in the table.
+  """
+  import numpy as np
+  rows = {}
+  for i, sta in enumerate(table['sta'].tolist()):
+    rows.setdefault(sta.upper(), []).append(i)
+  return dict((sta, np.array(idx, dtype=np.intp)) for sta, idx in rows.items())
+
+def compute_psd_batch(table, t, stations, rows=None):
+  """ Vectorized version of compute_psd(); compute the (total) PSD correction
+      per [e,n,u] component for a list of stations at a given time t, using
+      a PSD table as returned by load_psd_table().
+
+      Parameters:
+      -----------
+      table: dictionary
+          A PSD table, as returned by load_psd_table()
+      t: datetime.datetime
+          The time we want the PSD at.
+      stations: list of strings
+          The names of the stations (4-char ids)
+      rows: dictionary
+          The table rows indexed per station, as returned by
+          index_psd_table(table); if not given, it is computed here. Pass it
+          in when calling the function more than once with the same table.
+
+      Returns:
+      --------
+      tuple (of size 3)
+          Three numpy arrays, holding the (total) PSD in [e,n,u] components
+          respectively in mm; the i-th element of each array refers to the
+          i-th station in stations. Stations not found in the table get a
+          correction of 0; as in psd_from_records(), earthquakes after t
+          contribute nothing.
+  """
+  import numpy as np
+  if rows is None: rows = index_psd_table(table)
+  # gather the rows of all requested stations, plus the (station) index
+  # each row is to be added to
+  no_rows = np.empty(0, dtype=np.intp)
+  sta_rows = [rows.get(s.upper(), no_rows) for s in stations]
+  found = np.concatenate([no_rows] + sta_rows)
+  sta_idx = np.repeat(np.arange(len(stations), dtype=np.intp),
+                      [r.size for r in sta_rows])
+  # skip the earthquakes that occurred after t
+  t_sec = dt2epoch(t)
+  occurred = table['t0_sec'][found] <= t_sec
+  found, sta_idx = found[occurred], sta_idx[occurred]
+  dyr = (t_sec - table['t0_sec'][found])*_INV_YR_SEC
+  if have_numba():
+    # all three components in one (compiled) pass over the records
+    from itrftools._kernels import psd_table_kernel
+    args = []
+    for c in 'enu':
+      args += [table[key+c][found] for key in ('m', 'a1', 'it1', 'a2', 'it2')]
+    outs = [np.empty(dyr.shape) for c in 'enu']
+    psd_table_kernel(dyr, *(args + outs))
   else:
-    lon = .0e0;
-  # Ensure that Z-coordinate is unsigned.
-  absz = abs(z)
-  if p2>aeps2: # Continue unless at the poles
-    # Compute distance from polar axis.
-    p   = math.sqrt(p2)
-    # Normalize.
-    s0  = absz/a
-    pn  = p/a
-    zp  = ep*s0
-    # Prepare Newton correction factors.
-    c0  = ep*pn
-    c02 = c0*c0
-    c03 = c02*c0
-    s02 = s0*s0
-    s03 = s02*s0
-    a02 = c02+s02
-    a0  = math.sqrt(a02)
-    a03 = a02*a0
-    d0  = zp*a03 + e2*s03
-    f0  = pn*a03 - e2*c03
-    # Prepare Halley correction factor.
-    b0  = e4t*s02*c02*pn*(a0-ep)
-    s1  = d0*f0 - b0*s0
-    cp  = ep*(f0*f0-b0*c0)
-    # Evaluate latitude and height.
-    phi = math.atan(s1/cp);
-    s12 = s1*s1
-    cp2 = cp*cp
-    h = (p*cp+absz*s1-a*math.sqrt(ep2*s12+cp2))/math.sqrt(s12+cp2)
-  else: # // Special case: pole.
-    phi = math.pi / 2e0;
-    h   = absz - aep;
-  # Restore sign of latitude.
-  if z<0.e0: phi = -phi;
-  return phi, lon, h
+    outs = [psd_model_batch(table['m'+c][found], dyr,
+                            table['a1'+c][found], table['it1'+c][found],
+                            table['a2'+c][found], table['it2'+c][found])
+            for c in 'enu']
+  result = []
+  for out in outs:
+    res = np.zeros(len(stations))
+    np.add.at(res, sta_idx, out)
+    result.append(res)
+  return tuple(result)
 
 def enu2xyz(e, n, u, x, y, z):
   """ Transform a [e,n,u] vector (i.e.  local East, North, Up coordinates)
@@ -232,15 +526,41 @@ def enu2xyz(e, n, u, x, y, z):
           the list is: [x, y, z]
   """
   lat, lon, hgt = xyz2llh(x,y,z)
+  sl = math.sin(lon)
+  cl = math.cos(lon)
+  sf = math.sin(lat)
+  cf = math.cos(lat)
+  # [dx, dy, dz] = R * [e, n, u], with R = | -sl  -cl*sf  cl*cf |
+  #                                        |  cl  -sl*sf  sl*cf |
+  #                                        |  0     cf     sf   |
+  # (adding 0e0 turns a -0e0 result, e.g. for a zero [e,n,u] vector, to 0e0)
+  dx = -sl*e - cl*sf*n + cl*cf*u + 0e0
+  dy =  cl*e - sl*sf*n + sl*cf*u + 0e0
+  dz =  cf*n + sf*u + 0e0
+  return [dx, dy, dz]
+
+def enu2xyz_vec(e, n, u, x, y, z):
+  """ Vectorized version of enu2xyz(); transform arrays of [e,n,u] vectors,
+      each given at the respective cartesian position [x,y,z], to cartesian
+      [dX,dY,dZ] vectors. The ellipsoidal coordinates of all positions are
+      computed at once, via geodesy.xyz2llh_vec().
+
+      Returns:
+      -----------
+      tuple (of numpy.ndarray)
+          the [dx, dy, dz] arrays
+  """
+  import numpy as np
+  lat, lon, hgt = xyz2llh_vec(x, y, z)
   sl = np.sin(lon)
   cl = np.cos(lon)
   sf = np.sin(lat)
   cf = np.cos(lat)
-  R   = np.matrix([[-sl, -cl*sf, cl*cf],
-                   [cl,  -sl*sf, sl*cf],
-                   [0e0,  cf,    sf]])
-  enu = np.matrix([[e],[n],[u]])
-  return [item for sublist in (R * enu).tolist() for item in sublist]
+  e, n, u = [np.asarray(i, dtype=np.float64) for i in (e, n, u)]
+  dx = -sl*e - cl*sf*n + cl*cf*u + 0e0
+  dy =  cl*e - sl*sf*n + sl*cf*u + 0e0
+  dz =  cf*n + sf*u + 0e0
+  return dx, dy, dz
 
 ## Example usage
 ##if __name__ == "__main__":
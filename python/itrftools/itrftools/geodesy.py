@@ -0,0 +1,93 @@
+#! /usr/bin/python
+
+import math
+from itrftools._jit import have_numba
+
+def xyz2llh(x, y, z, a=6378137e0, f=0.003352810681183637418):
+  """ Cartesian to ellispoidal coordinates, based on
+      Transformation from Cartesian to geodetic coordinates accelerated by 
+      Halley's method, J. Geodesy (2006), 79(12): 689-693
+      If numba is available, a compiled version of this function is used by
+      xyz2llh_vec().
+  """
+  # Functions of ellipsoid parameters.
+  aeps2 = a*a*1e-32
+  e2    = (2.0e0-f)*f
+  e4t   = e2*e2*1.5e0
+  ep2   = 1.0e0-e2
+  ep    = math.sqrt(ep2)
+  aep   = a*ep
+  # Compute Coefficients of (Modified) Quartic Equation
+  # Remark: Coefficients are rescaled by dividing by 'a'
+  # Compute distance from polar axis squared.
+  p2 = x*x + y*y
+  # Compute longitude lambda.
+  if p2:
+    lon = math.atan2(y, x)
+  else:
+    lon = .0e0;
+  # Ensure that Z-coordinate is unsigned.
+  absz = abs(z)
+  if p2>aeps2: # Continue unless at the poles
+    # Compute distance from polar axis.
+    p   = math.sqrt(p2)
+    # Normalize.
+    s0  = absz/a
+    pn  = p/a
+    zp  = ep*s0
+    # Prepare Newton correction factors.
+    c0  = ep*pn
+    c02 = c0*c0
+    c03 = c02*c0
+    s02 = s0*s0
+    s03 = s02*s0
+    a02 = c02+s02
+    a0  = math.sqrt(a02)
+    a03 = a02*a0
+    d0  = zp*a03 + e2*s03
+    f0  = pn*a03 - e2*c03
+    # Prepare Halley correction factor.
+    b0  = e4t*s02*c02*pn*(a0-ep)
+    s1  = d0*f0 - b0*s0
+    cp  = ep*(f0*f0-b0*c0)
+    # Evaluate latitude and height.
+    phi = math.atan(s1/cp);
+    s12 = s1*s1
+    cp2 = cp*cp
+    h = (p*cp+absz*s1-a*math.sqrt(ep2*s12+cp2))/math.sqrt(s12+cp2)
+  else: # // Special case: pole.
+    phi = math.pi / 2e0;
+    h   = absz - aep;
+  # Restore sign of latitude.
+  if z<0.e0: phi = -phi;
+  return phi, lon, h
+
+def xyz2llh_vec(x, y, z):
+  """ Vectorized version of xyz2llh(); transform arrays of cartesian
+      coordinates to ellipsoidal. If numba is available, the computation is
+      spread over all cores.
+
+      Parameters:
+      -----------
+      x, y, z: array-like (of floats)
+          Cartesian coordinates in m
+
+      Returns:
+      -----------
+      tuple (of numpy.ndarray)
+          latitude (rad), longitude (rad) and height (m) arrays
+  """
+  import numpy as np
+  x = np.ascontiguousarray(x, dtype=np.float64)
+  y = np.ascontiguousarray(y, dtype=np.float64)
+  z = np.ascontiguousarray(z, dtype=np.float64)
+  lat = np.empty_like(x)
+  lon = np.empty_like(x)
+  hgt = np.empty_like(x)
+  if have_numba():
+    from itrftools._kernels import xyz2llh_kernel
+    xyz2llh_kernel(x, y, z, lat, lon, hgt)
+  else:
+    for i in range(x.shape[0]):
+      lat[i], lon[i], hgt[i] = xyz2llh(x[i], y[i], z[i])
+  return lat, lon, hgt
@@ -1,8 +1,8 @@
 #! /usr/bin/python
 
 from __future__ import print_function
-import sys, datetime
-from itrftools.compute_psd import time_str2dt
+import sys, io, datetime
+from itrftools.compute_psd import time_str2dt, dt2epoch, read_text, _INV_YR_SEC
 # sys.path.append('.')
 
 def read_header(fstream):
@@ -71,16 +71,13 @@ def read_next_record(line, fstream):
     cid    = line[32:36]
     tstart = datetime.datetime.min
     tstop  = datetime.datetime.max
-    try: # start and stop times included
-        stop_col = line[36:].index(':') - 2 + 36
-        dstrs = line[stop_col:].split()
-        assert( len(dstrs) == 2 )
-        if dstrs[0].strip() != '00:000:00000': tstart = time_str2dt(dstrs[0]) 
-        if dstrs[1].strip() != '00:000:00000': tstop  = time_str2dt(dstrs[1])
-        stop_col -= 4
-    except:
-        stop_col = len(line) - 1
-    x, y, z, sx, sy, sz = map(float, line[36:stop_col].split())
+    # fields are: x, y, z, sx, sy, sz [, soln, data_start, data_end]
+    fields = line[36:].split()
+    if len(fields) > 6: # start and stop times included
+        assert( len(fields) == 9 )
+        if fields[7] != '00:000:00000': tstart = time_str2dt(fields[7])
+        if fields[8] != '00:000:00000': tstop  = time_str2dt(fields[8])
+    x, y, z, sx, sy, sz = map(float, fields[0:6])
     line = fstream.readline()
     l = line.split()
     assert( l[0] == domes and len(l) == 7 )
@@ -103,17 +100,76 @@ def extrapolate(dtq, x0, vx):
         dtq: float
              Delta years from ti to t0 (i.e. time difference from reference epoch
              to the time we want the computation at).
-        x0: float
+        x0: float (or numpy.ndarray)
             constant term of the linear model
-        vx: float
+        vx: float (or numpy.ndarray)
             Velocity of the linear mode (must be annual)
         Returns:
         ---------
-        float
+        float (or numpy.ndarray)
             Value of the model at delta time dtq (i.e. x0+vx(ti-t0) = x0+vx*dtq).
+            If x0 and vx are arrays, the model is evaluated element-wise.
     """
     return x0 + vx*dtq
 
+def read_ssc(ssc_file):
+    """ Read and resolve a whole .SSC file, i.e. its header and all station
+        records.
+
+        Parameters:
+        -----------
+        ssc_file: string
+            The .SSC (.txt) file to read.
+
+        Returns:
+        --------
+        tuple
+            A three-element tuple, where the first two elements are the
+            reference frame name and reference epoch (see read_header()) and
+            the third is a list of all station records in the file (each as
+            returned by read_next_record()).
+    """
+    records = []
+    fin = io.StringIO(read_text(ssc_file))
+    frame, refepoch = read_header(fin)
+    line = fin.readline()
+    while line:
+        records.append(read_next_record(line, fin))
+        line = fin.readline()
+    return frame, refepoch, records
+
+def extrapolate_records(records, t0, t=datetime.datetime.now(), station=[], domes=[]):
+    """ Same as itrf_extrapolate(), but the station records are passed in
+        (e.g. as read off from an .SSC file via read_ssc()) instead of the
+        .SSC file name; this way the same (already parsed) records can be
+        queried more than once.
+
+        Parameters:
+        -----------
+        records: list of dictionaries
+            Station records, each as returned by read_next_record()
+        t0, t, station, domes:
+            See itrf_extrapolate()
+
+        Returns:
+        --------
+        See itrf_extrapolate()
+    """
+    import numpy as np
+    station = frozenset(x.upper() for x in station)
+    domes   = frozenset(domes)
+    matched = [ dic for dic in records
+                if (dic['domes'] in domes or dic['id'] in station)
+                and dic['start'] <= t < dic['stop'] ]
+    if not matched: return []
+    # extrapolate all matched stations at once
+    dyr  = (dt2epoch(t) - dt2epoch(t0))*_INV_YR_SEC
+    xyz0 = np.array([[dic['x'], dic['y'], dic['z']] for dic in matched])
+    vxyz = np.array([[dic['vx'], dic['vy'], dic['vz']] for dic in matched])
+    xyz  = extrapolate(dyr, xyz0, vxyz).tolist()
+    return [{'station': dic['id'], 'domes': dic['domes'], 'x': x, 'y': y, 'z': z}
+            for dic, (x, y, z) in zip(matched, xyz)]
+
 def itrf_extrapolate(ssc_file, t0, t=datetime.datetime.now(), station=[], domes=[]):
     """ Given an (ITRF) .SSC file, compute the coordinates of a station list
         at the given epoch (t).The stations can be described by either passing
@@ -142,23 +198,8 @@ def itrf_extrapolate(ssc_file, t0, t=datetime.datetime.now(), station=[], domes=
             Stations which were not matched are not included in the list.
 
     """ 
-    results = []
-    if station: station = [ x.upper() for x in station ]
-    with open(ssc_file) as fin:
-        frame, refepoch = read_header(fin)
-        line = fin.readline()
-        while line:
-            dic = read_next_record(line, fin)
-            if dic['domes'] in domes or dic['id'] in station:
-                if t >= dic['start'] and t < dic['stop']:
-                    dt  = t - t0
-                    dyr = (dt.days + dt.seconds/86400e0)/365.25
-                    x   = extrapolate(dyr, dic['x'], dic['vx'])
-                    y   = extrapolate(dyr, dic['y'], dic['vy'])
-                    z   = extrapolate(dyr, dic['z'], dic['vz'])
-                    results.append({'station': dic['id'], 'domes': dic['domes'], 'x': x, 'y': y, 'z': z})
-            line = fin.readline()
-        return results
+    frame, refepoch, records = read_ssc(ssc_file)
+    return extrapolate_records(records, t0, t, station, domes)
 
 # example usage
 #if __name__ == "__main__":
@@ -1,11 +1,23 @@
 #! /usr/bin/python
 
 import math
+try:
+  from enum import IntEnum
+except ImportError:
+  ## Python 2 (without the enum34 backport): the Model members are plain ints
+  IntEnum = object
+from itrftools._jit import have_numba, njit
+try:
+  from itrftools import parametric_c as _c
+except ImportError:
+  _c = None
 ## Last updated: August 17, 2015
 
-def md_pwl():
+def md_pwl(*args):
   """ Compute the post-seismic deformation/correction "d" using parametric
-      model PWL (Piece-Wise Linear Function)
+      model PWL (Piece-Wise Linear Function). Any arguments passed in are
+      ignored, so that the function can be called with the same signature
+      as the rest of the models.
 
       Returns
       ----------------------------------------------------------------------
@@ -37,9 +49,11 @@ def md_log(dtq, a1, t1):
       ----------------------------------------------------------------------
       Time unit is decimal year. It is advised to compute "dtq" by:
       (MJD - MJD_Earthquake)/365.25 where MJD is the modified julian day.
+      d = a1*log(1 + dtq/t1), computed via log1p so that it keeps full
+      precision for small dtq/t1 (i.e. right after the earthquake).
 
   """
-  return a1*math.log(1e0+dtq/t1)
+  return a1*math.log1p(dtq/t1)
 
 def md_exp(dtq, a1, t1):
   """ Compute the post-seismic deformation/correction "d" using parametric
@@ -63,10 +77,11 @@ def md_exp(dtq, a1, t1):
       ----------------------------------------------------------------------
       Time unit is decimal year. It is advised to compute "dtq" by:
       (MJD - MJD_Earthquake)/365.25 where MJD is the modified julian day.
+      d = a1*(1 - exp(-dtq/t1)), computed via expm1 so that it keeps full
+      precision for small dtq/t1 (i.e. right after the earthquake).
 
   """
-  te1 = dtq/t1
-  return a1*(1e0-math.exp(-te1))
+  return -a1*math.expm1(-dtq/t1)
 
 def md_logexp(dtq, a1, t1, a2, t2):
   """ Compute the post-seismic deformation/correction "d" using parametric
@@ -94,10 +109,11 @@ def md_logexp(dtq, a1, t1, a2, t2):
       ----------------------------------------------------------------------
       Time unit is decimal year. It is advised to compute "dtq" by:
       (MJD - MJD_Earthquake)/365.25 where MJD is the modified julian day.
+      d = a1*log(1 + dtq/t1) + a2*(1 - exp(-dtq/t2)), computed via log1p
+      and expm1 so that it keeps full precision for small dtq.
 
   """
-  te2 = dtq/t2
-  return a1*math.log(1+dtq/t1) + a2*(1-math.exp(-te2))
+  return a1*math.log1p(dtq/t1) - a2*math.expm1(-dtq/t2)
 
 def md_expexp(dtq, a1, t1, a2, t2):
   """ Compute the post-seismic deformation/correction "d" using parametric
@@ -125,20 +141,85 @@ def md_expexp(dtq, a1, t1, a2, t2):
       ----------------------------------------------------------------------
       Time unit is decimal year. It is advised to compute "dtq" by:
       (MJD - MJD_Earthquake)/365.25 where MJD is the modified julian day.
+      d = a1*(1 - exp(-dtq/t1)) + a2*(1 - exp(-dtq/t2)), computed via
+      expm1 so that it keeps full precision for small dtq.
 
   """
-  te1 = dtq/t1
-  te2 = dtq/t2
-  return a1*(1e0-math.exp(-te1)) + a2*(1e0-math.exp(-te2))
+  return -a1*math.expm1(-dtq/t1) - a2*math.expm1(-dtq/t2)
 
-def parametric(model='pwl', *args):
+## Model functions, indexed by the (int) model id used in PSD files; use as
+## MODELS[model](dtq, *params) to skip the dispatching done by parametric().
+MODELS = (md_pwl, md_log, md_exp, md_logexp, md_expexp)
+
+class Model(IntEnum):
+  """ The parametric models, valued by their (int) model id """
+  PWL = 0
+  LOG = 1
+  EXP = 2
+  LOGEXP = 3
+  EXPEXP = 4
+
+## String types a model name can be given as (Python 2 also has unicode)
+try:
+  _STR_TYPES = (str, unicode)
+except NameError:
+  _STR_TYPES = (str,)
+
+## Model names, indexed by the (int) model id, and the reverse mapping
+_MODEL_NAMES = ('pwl', 'log', 'exp', 'logexp', 'expexp')
+_MODEL_IDS = dict((name, idx) for idx, name in enumerate(_MODEL_NAMES))
+
+def _model_idx(model):
+  """ The (int) model id of model, given as a name, an id or a Model member;
+      raises KeyError for an invalid name and IndexError for an invalid id.
+  """
+  idx = _MODEL_IDS[model] if isinstance(model, _STR_TYPES) else model
+  if not 0 <= idx < len(MODELS):
+    raise IndexError('Invalid model id: {:}'.format(model))
+  return idx
+
+## Model functions used by parametric(), indexed by the (int) model id; if
+## built, the C versions (see parametric_c.pyx) are used
+if _c is None:
+  _SCALAR_DISPATCH = MODELS
+else:
+  _SCALAR_DISPATCH = (md_pwl, _c.md_log_c, _c.md_exp_c, _c.md_logexp_c,
+                      _c.md_expexp_c)
+
+## Names of the (positional) model function arguments
+_ARG_NAMES = ('dtq', 'a1', 't1', 'a2', 't2')
+
+## Fast-math flags for the compiled (numba) models: allows reciprocal
+## approximations, approximate math functions (i.e. vector SVML calls), FMA
+## contraction and ignoring the sign of zero, but no reassociation, so that
+## log1p/expm1 keep their accuracy close to the earthquake epoch (dtq ~ 0).
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn'}
+
+def md_any(model, dtq, a1, inv_t1, a2, inv_t2):
+  """ Compute the post-seismic deformation/correction "d" using the
+      parametric model with (int) id model; a1, a2 are the model amplitudes
+      and inv_t1, inv_t2 the reciprocals of the relaxation times, i.e. 1/t1
+      and 1/t2 (the ones not used by the model are ignored). A compiled
+      version is used by the numba kernels (see _kernels.py).
+  """
+  if model == 1:
+    return a1*math.log1p(dtq*inv_t1)
+  if model == 2:
+    return -a1*math.expm1(-dtq*inv_t1)
+  if model == 3:
+    return a1*math.log1p(dtq*inv_t1) - a2*math.expm1(-dtq*inv_t2)
+  if model == 4:
+    return -a1*math.expm1(-dtq*inv_t1) - a2*math.expm1(-dtq*inv_t2)
+  return 0e0
+
+def parametric(model='pwl', *args, **kwargs):
   """ Compute the post-seismic deformation/correction "d" using the 
       parametric model specified by the (input) variable 'model'.
 
       Parameters
       ----------------------------------------------------------------------
-      model: string or int
-          can be any of the following:
+      model: string, int or Model
+          can be any of the following (or the equivalent Model member):
           - 'pwl' or 0 to denote a Piece-Wise Linear Model
           - 'log' or 1 to denote a Logarithmic Model
           - 'exp' or 2 to denote an Exponential Model
@@ -169,25 +250,423 @@ def parametric(model='pwl', *args):
       ----------------------------------------------------------------------
       Time unit is decimal year. It is advised to compute "dtq" by:
       (MJD - MJD_Earthquake)/365.25 where MJD is the modified julian day.
+      An invalid model name raises a KeyError and an invalid (int) model id
+      an IndexError.
+      The model parameters can also be passed as keyword arguments (using the
+      names above), e.g. parametric('log', dtq=1.5, a1=2.3, t1=0.5); these
+      follow any positional ones.
+      If any of the arguments is a numpy array (of at least one dimension;
+      numpy scalars take the scalar path), the model is evaluated
+      element-wise, using numpy's log1p/expm1 ufuncs, and an array is
+      returned. As in NumPy, the input is not checked: each element gets the
+      same value as the scalar call, or nan/inf where that raises. This
+      needs neither numba nor any JIT compilation; for the (compiled) fused
+      kernels use parametric_batch(), and see md_log_u, md_exp_u,
+      md_logexp_u and md_expexp_u for the numba ufuncs.
+
+  """
+  if kwargs:
+    given = _ARG_NAMES[:len(args)]
+    names = _ARG_NAMES[len(args):]
+    for error, bad in (
+        ('multiple values for', [k for k in given if k in kwargs]),
+        ('unexpected keyword', [k for k in kwargs if k not in _ARG_NAMES])):
+      if bad:
+        raise TypeError('parametric() got {:} argument(s): {:}'.format(
+          error, ', '.join(sorted(bad))))
+    # keyword arguments must complete the positional ones, without gaps
+    last = max(names.index(k) for k in kwargs)
+    missing = [k for k in names[:last] if k not in kwargs]
+    if missing:
+      raise TypeError('parametric() missing argument(s): {:}'.format(
+        ', '.join(missing)))
+    args += tuple(kwargs[k] for k in names[:last+1])
+  idx = _MODEL_IDS[model] if isinstance(model, _STR_TYPES) else model
+  if not 0 <= idx < len(MODELS):
+    raise IndexError('Invalid model id: {:}'.format(model))
+  for arg in args:
+    if getattr(arg, 'ndim', 0) > 0: return _NP_DISPATCH[idx](*args)
+  return _SCALAR_DISPATCH[idx](*args)
+
+def make_parametric(model, compile=False):
+  """ Return the function computing the post-seismic deformation/correction
+      for the given model (see parametric() for the model ids), so that it
+      can be called repeatedly without any dispatching; the function is
+      called as f(dtq, a1, t1[, a2, t2]).
+      If compile is True (and numba is available), the function is compiled
+      (for the argument types it is first called with); the result can also
+      be called from other numba-compiled code.
+  """
+  idx = _model_idx(model)
+  if compile:
+    return njit(fastmath=_FASTMATH)(MODELS[idx])
+  return _SCALAR_DISPATCH[idx]
 
+def compile_station_model(model, a1=None, t1=None, a2=None, t2=None,
+                          compile=False):
+  """ Return a function f(dtq) computing the post-seismic deformation/
+      correction for the given model (see parametric()) and model parameters
+      a1, t1 [, a2, t2], e.g. for one station component and earthquake; the
+      parameters (and the reciprocals of the relaxation times) are bound once
+      here, so repeated calls (e.g. over a series of epochs) only do the
+      math.
+      If compile is True, the function accepts either a float or a numpy
+      array dtq; if numba is available, it calls the generic (compiled once,
+      for all models) kernels of _kernels.py, with the parameters bound
+      outside numba, so no compilation happens per call of this function.
   """
-  model_dict = {'pwl': md_pwl,
-                'log': md_log,
-                'exp': md_exp,
-                'logexp': md_logexp,
-                'expexp': md_expexp}
+  idx = _model_idx(model)
+  if compile:
+    return _compiled_station_model(idx, a1, t1, a2, t2)
+  log1p, expm1 = math.log1p, math.expm1
+  if idx == Model.PWL:
+    f = lambda dtq: 0e0*dtq
+  elif idx == Model.LOG:
+    f = lambda dtq, a1=a1, it1=1e0/t1: a1*log1p(dtq*it1)
+  elif idx == Model.EXP:
+    f = lambda dtq, a1=a1, it1=1e0/t1: -a1*expm1(-dtq*it1)
+  elif idx == Model.LOGEXP:
+    f = ( lambda dtq, a1=a1, it1=1e0/t1, a2=a2, it2=1e0/t2:
+          a1*log1p(dtq*it1) - a2*expm1(-dtq*it2) )
+  else:
+    f = ( lambda dtq, a1=a1, it1=1e0/t1, a2=a2, it2=1e0/t2:
+          -a1*expm1(-dtq*it1) - a2*expm1(-dtq*it2) )
+  return f
+
+def _compiled_station_model(idx, a1, t1, a2, t2):
+  """ compile_station_model(..., compile=True) for the (valid) model id idx """
+  import numpy as np
+  if not have_numba():
+    params = (a1, t1, a2, t2)[:(0, 2, 2, 4, 4)[idx]]
+    return lambda dtq: _NP_DISPATCH[idx](dtq, *params)
+  from itrftools._kernels import md_any, md_any_kernel
+  a1  = a1 if idx != Model.PWL else 0e0
+  it1 = 1e0/t1 if idx != Model.PWL else 0e0
+  a2  = a2 if idx > Model.EXP else 0e0
+  it2 = 1e0/t2 if idx > Model.EXP else 0e0
+  def f(dtq):
+    if getattr(dtq, 'ndim', 0) == 0:
+      return md_any(idx, dtq, a1, it1, a2, it2)
+    dtq = np.ascontiguousarray(dtq, dtype=np.float64)
+    out = np.empty(dtq.shape)
+    md_any_kernel(idx, dtq.reshape(-1), a1, it1, a2, it2, out.reshape(-1))
+    return out
+  return f
+
+## Vectorized versions of the models; these accept numpy arrays (or anything
+## that broadcasts against them) and evaluate the model element-wise, using
+## numpy's log1p/expm1 ufuncs. They do not check their input: as with
+## NumPy, out-of-domain elements give nan (or inf). The models are only
+## defined for dtq >= 0 and positive relaxation times; parametric_batch()
+## checks this by a (debug) assertion, skipped when running python with -O.
+
+def _in_domain(dtq, *ts):
+  """ True if all time differences dtq are non-negative and all relaxation
+      times ts positive.
+  """
+  import numpy as np
+  return bool(np.all(np.asarray(dtq) >= 0e0)
+              and all(np.all(np.asarray(t) > 0e0) for t in ts))
+
+def md_pwl_vec(dtq, *args):
+  """ Vectorized version of md_pwl(); returns an array of zeros, shaped as
+      the broadcast of all arguments (float32 if dtq is float32, else float64).
+  """
+  import numpy as np
+  dtype = np.float32 if np.asarray(dtq).dtype == np.float32 else np.float64
+  return np.zeros(np.broadcast(dtq, *args).shape, dtype=dtype)
+
+def md_log_vec(dtq, a1, t1):
+  """ Vectorized version of md_log() """
+  import numpy as np
+  return a1*np.log1p(dtq*(1e0/t1))
+
+def md_exp_vec(dtq, a1, t1):
+  """ Vectorized version of md_exp() """
+  import numpy as np
+  return -a1*np.expm1(-dtq*(1e0/t1))
+
+def _logexp_np(dtq, a1, t1, a2, t2):
+  """ md_logexp() using numpy's ufuncs only """
+  import numpy as np
+  return a1*np.log1p(dtq*(1e0/t1)) - a2*np.expm1(-dtq*(1e0/t2))
+
+def _expexp_np(dtq, a1, t1, a2, t2):
+  """ md_expexp() using numpy's ufuncs only """
+  import numpy as np
+  return -a1*np.expm1(-dtq*(1e0/t1)) - a2*np.expm1(-dtq*(1e0/t2))
+
+def md_logexp_vec(dtq, a1, t1, a2, t2, out=None):
+  """ Vectorized version of md_logexp(). If numba (or else the C extension)
+      is available, both terms are computed in a single (compiled) pass over
+      the input.
+      If given, the result is written to out (a C-contiguous float64 or
+      float32 array shaped as the broadcast of the input, else a ValueError
+      is raised).
+  """
+  if have_numba():
+    from itrftools._fused_kernels import logexp_kernel, logexp_kernel_s
+    return _fused(logexp_kernel, logexp_kernel_s, dtq, (a1, t1, a2, t2), out)
+  if _c is not None:
+    return _fused(_c.logexp_kernel, _c.logexp_kernel_s, dtq, (a1, t1, a2, t2), out)
+  res = _logexp_np(dtq, a1, t1, a2, t2)
+  if out is None: return res
+  out[...] = res
+  return out
+
+def md_expexp_vec(dtq, a1, t1, a2, t2, out=None):
+  """ Vectorized version of md_expexp(). If numba (or else the C extension)
+      is available, both terms are computed in a single (compiled) pass over
+      the input.
+      If given, the result is written to out (a C-contiguous float64 or
+      float32 array shaped as the broadcast of the input, else a ValueError
+      is raised).
+  """
+  if have_numba():
+    from itrftools._fused_kernels import expexp_kernel, expexp_kernel_s
+    return _fused(expexp_kernel, expexp_kernel_s, dtq, (a1, t1, a2, t2), out)
+  if _c is not None:
+    return _fused(_c.expexp_kernel, _c.expexp_kernel_s, dtq, (a1, t1, a2, t2), out)
+  res = _expexp_np(dtq, a1, t1, a2, t2)
+  if out is None: return res
+  out[...] = res
+  return out
+
+def _fused(kernel, kernel_s, dtq, params, out=None):
+  """ Run a fused kernel over dtq (and the model parameters params), all
+      flattened to 1-D; params are a1, t1, a2, t2 (the relaxation times are
+      inverted here). If all parameters are scalars, the (faster) scalar
+      flavour kernel_s is used. The computation is done in the precision of
+      out if given, else in float32 if dtq is float32 and float64 otherwise.
+  """
+  import numpy as np
+  if out is not None:
+    dtype = out.dtype.type
+  else:
+    dtype = np.float32 if np.asarray(dtq).dtype == np.float32 else np.float64
+  a1, t1, a2, t2 = params
+  params = (a1, 1e0/np.asarray(t1, dtype=dtype),
+            a2, 1e0/np.asarray(t2, dtype=dtype))
+  shape = np.broadcast(dtq, *params).shape
+  def flat(x):
+    ## a read-only, contiguous 1-D view of x broadcasted to shape
+    x = np.ascontiguousarray(np.broadcast_to(x, shape), dtype=dtype).reshape(-1)
+    x.flags.writeable = False
+    return x
+  if out is None:
+    out = np.empty(shape, dtype=dtype)
+  elif out.shape != shape or not out.flags.c_contiguous:
+    raise ValueError('out must be a C-contiguous array of shape {:}'.format(shape))
+  if all(np.ndim(p) == 0 for p in params):
+    kernel_s(flat(dtq), *([dtype(p) for p in params] + [out.reshape(-1)]))
+  else:
+    kernel(flat(dtq), *([flat(p) for p in params] + [out.reshape(-1)]))
+  return out
+
+## Vectorized model functions, indexed by the (int) model id
+_VEC_DISPATCH = (md_pwl_vec, md_log_vec, md_exp_vec, md_logexp_vec,
+                 md_expexp_vec)
 
-  int_model_dict = {0: 'pwl',
-                    1: 'log',
-                    2: 'exp',
-                    3: 'logexp',
-                    4: 'expexp'}
+## Vectorized model functions using numpy's ufuncs only (no compiled
+## kernels, hence no numba import or JIT warm-up), indexed by the (int)
+## model id; used by parametric() for array arguments
+_NP_DISPATCH = (md_pwl_vec, md_log_vec, md_exp_vec, _logexp_np, _expexp_np)
+
+def parametric_batch(model, dtq, *args, **kwargs):
+  """ Vectorized version of parametric(); compute the post-seismic
+      deformation/correction "d" for arrays of time differences (and/or
+      model parameters) in one call.
+
+      Parameters
+      ----------------------------------------------------------------------
+      model: string or int
+          The model to use; see parametric()
+      dtq : array-like (of floats)
+            time differences (t-t_Earthquake) in decimal years
+      args: array-likes (or floats)
+            The model parameters, in the order a1, t1 [, a2, t2], as in
+            parametric(); any of them can be an array, as long as all
+            arguments broadcast against each other.
+      dtype: numpy.float64 (default) or numpy.float32
+            (keyword only) precision of the computation; all inputs are
+            converted to dtype. Single precision is well within the
+            accuracy of the models and halves the memory traffic for large
+            arrays.
+
+      Returns
+      ----------------------------------------------------------------------
+      numpy.ndarray
+            post-seismic corrections in mm, of type dtype
+  """
+  import numpy as np
+  dtype = kwargs.pop('dtype', np.float64)
+  if kwargs:
+    raise TypeError('parametric_batch() got unexpected keyword argument(s): {:}'.format(
+      ', '.join(sorted(kwargs))))
+  idx  = _model_idx(model)
+  dtq  = np.asarray(dtq, dtype=dtype)
+  args = [np.asarray(a, dtype=dtype) for a in args]
+  assert idx == 0 or _in_domain(dtq, *args[1::2]), \
+    'dtq must be non-negative and the relaxation times positive'
+  return _VEC_DISPATCH[idx](dtq, *args)
+
+def parametric_batch_multi(models, dtq, params, block=4096):
+  """ Evaluate several models (e.g. for different stations/components) over
+      the same (1-D) array of time differences dtq. If numba is available,
+      all models are evaluated in a single (compiled, multi-threaded) loop,
+      in blocks of block elements: all models are computed for each block
+      before moving to the next, so that each block of dtq stays in cache.
+      This saves the per-model call overhead of parametric_batch(), which
+      dominates for many models over short arrays (for long arrays, the
+      cost is in log1p/expm1 either way). Without numba, each model is
+      evaluated over dtq using its vectorized version.
+
+      Parameters
+      ----------------------------------------------------------------------
+      models: list (of strings or ints)
+          The models to evaluate; see parametric()
+      dtq : array-like (of floats)
+            time differences (t-t_Earthquake) in decimal years
+      params: list (of tuples of floats)
+            The (scalar) parameters for each of the models, i.e. a1, t1
+            [, a2, t2], as in parametric()
+      block: int
+            Number of elements of dtq evaluated at a time (numba only)
+
+      Returns
+      ----------------------------------------------------------------------
+      numpy.ndarray
+            post-seismic corrections in mm, with shape (len(models), len(dtq))
+  """
+  import numpy as np
+  dtq = np.ascontiguousarray(dtq, dtype=np.float64)
+  ids = np.array([_model_idx(m) for m in models], dtype=np.int64)
+  out = np.empty((ids.shape[0], dtq.shape[0]))
+  if not have_numba():
+    for i, idx in enumerate(ids):
+      out[i] = _VEC_DISPATCH[idx](dtq, *params[i])
+    return out
+  from itrftools._kernels import multi_model_kernel
+  # the parameters of all models, padded to a1, t1, a2, t2 (unused ones are
+  # zero); the relaxation times are inverted
+  a1, inv_t1, a2, inv_t2 = np.zeros((4, ids.shape[0]))
+  for i, p in enumerate(params):
+    if len(p) > 0: a1[i], inv_t1[i] = p[0], 1e0/p[1]
+    if len(p) > 2: a2[i], inv_t2[i] = p[2], 1e0/p[3]
+  multi_model_kernel(ids, dtq, a1, inv_t1, a2, inv_t2, block, out)
+  return out
+
+## Numba ufuncs (element-wise, broadcasting and multi-threaded) for the
+## models; compiling these takes a while, so they are built the first time
+## they are needed (see _ufuncs()) and are available as md_log_u, md_exp_u,
+## md_logexp_u and md_expexp_u. Without numba, these are the vectorized
+## NumPy versions of the models.
+
+_UFUNC_SIGS = (
+  ['float64(float64,float64,float64)',
+   'float32(float32,float32,float32)'],
+  ['float64(float64,float64,float64,float64,float64)',
+   'float32(float32,float32,float32,float32,float32)'])
+
+_UFUNC_NAMES = {'md_log_u': 1, 'md_exp_u': 2, 'md_logexp_u': 3,
+                'md_expexp_u': 4}
+
+_UFUNCS = []
+
+def _ufuncs():
+  """ Return the ufunc versions of the models, indexed by the (int) model
+      id; the ufuncs are compiled on the first call.
+  """
+  if not _UFUNCS:
+    if have_numba():
+      from numba import vectorize
+      ufunc = lambda sigs, func: vectorize(sigs, nopython=True, fastmath=_FASTMATH,
+                                           target='parallel', cache=True)(func)
+      funcs = (md_pwl_vec,
+               ufunc(_UFUNC_SIGS[0], md_log),
+               ufunc(_UFUNC_SIGS[0], md_exp),
+               ufunc(_UFUNC_SIGS[1], md_logexp),
+               ufunc(_UFUNC_SIGS[1], md_expexp))
+    else:
+      funcs = _VEC_DISPATCH
+    _UFUNCS.extend(funcs)
+  return _UFUNCS
+
+## Lazy module attributes (PEP 562, Python >= 3.7); on older versions use
+## _ufuncs() directly.
+def __getattr__(name):
+  if name in _UFUNC_NAMES: return _ufuncs()[_UFUNC_NAMES[name]]
+  raise AttributeError('module {:} has no attribute {:}'.format(__name__, name))
+
+def _log1p_checked(x):
+  """ log1p(x), raising ValueError (as math.log1p() does) for x <= -1;
+      compiled code returns nan instead.
+  """
+  if x <= -1e0: raise ValueError('math domain error')
+  return math.log1p(x)
+
+def _expm1_checked(x):
+  """ expm1(x), raising OverflowError (as math.expm1() does) if the result
+      overflows; compiled code returns inf instead.
+  """
+  r = math.expm1(x)
+  if math.isinf(r) and not math.isinf(x): raise OverflowError('math range error')
+  return r
+
+def build_aot(output_dir=None, name='parametric_compiled'):
+  """ Compile the (scalar) models ahead-of-time, using numba.pycc, into an
+      extension module (named name) placed in output_dir (default is the
+      package directory); the module exports md_log_f8, md_exp_f8,
+      md_logexp_f8 and md_expexp_f8, which need no JIT warm-up and are
+      picked up by parametric() when present (unless the C extension is
+      built). Like the Python models, they raise ZeroDivisionError,
+      ValueError and OverflowError (instead of returning nan/inf).
+      Returns False if numba.pycc is not available, True otherwise.
+  """
+  import os
+  try:
+    from numba.pycc import CC
+  except ImportError:
+    return False
+  log1p, expm1 = njit(_log1p_checked), njit(_expm1_checked)
+  def md_log_f8(dtq, a1, t1):
+    return a1*log1p(dtq/t1)
+  def md_exp_f8(dtq, a1, t1):
+    return -a1*expm1(-dtq/t1)
+  def md_logexp_f8(dtq, a1, t1, a2, t2):
+    return a1*log1p(dtq/t1) - a2*expm1(-dtq/t2)
+  def md_expexp_f8(dtq, a1, t1, a2, t2):
+    return -a1*expm1(-dtq/t1) - a2*expm1(-dtq/t2)
+  cc = CC(name)
+  cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+  cc.export('md_log_f8', 'f8(f8,f8,f8)')(md_log_f8)
+  cc.export('md_exp_f8', 'f8(f8,f8,f8)')(md_exp_f8)
+  cc.export('md_logexp_f8', 'f8(f8,f8,f8,f8,f8)')(md_logexp_f8)
+  cc.export('md_expexp_f8', 'f8(f8,f8,f8,f8,f8)')(md_expexp_f8)
+  cc.compile()
+  return True
+
+if _c is None:
   try:
-    model + 1
-    return ( model_dict[int_model_dict[model]](*args)
-      if model > 0
-      else model_dict[int_model_dict[model]]() )
-  except:
-    return ( model_dict[model](*args)
-      if model != 'pwl'
-      else model_dict[model]() )
+    from itrftools import parametric_compiled as _aot
+    _SCALAR_DISPATCH = (md_pwl, _aot.md_log_f8, _aot.md_exp_f8,
+                        _aot.md_logexp_f8, _aot.md_expexp_f8)
+  except ImportError:
+    pass
+
+if __name__ == "__main__":
+  import numpy as np
+  ## evaluate all five models for the same parameters, in one batch
+  models = np.arange(5)
+  dtq = np.full(5, 3.5e0)
+  a1, t1, a2, t2 = np.full(5, 1.3e0), np.full(5, .9e0), np.full(5, 2e0), np.full(5, .4e0)
+  d = np.where(models == Model.PWL, 0e0,
+      np.where(models == Model.LOG, parametric_batch(Model.LOG, dtq, a1, t1),
+      np.where(models == Model.EXP, parametric_batch(Model.EXP, dtq, a1, t1),
+      np.where(models == Model.LOGEXP,
+               parametric_batch(Model.LOGEXP, dtq, a1, t1, a2, t2),
+               parametric_batch(Model.EXPEXP, dtq, a1, t1, a2, t2)))))
+  for m, name in enumerate(_MODEL_NAMES):
+    ds = ( parametric(m, 3.5e0, 1.3e0, .9e0) if m < Model.LOGEXP
+      else parametric(m, 3.5e0, 1.3e0, .9e0, 2e0, .4e0) )
+    print('Model {:6s}: d = {:+.6f} mm (scalar call: {:+.6f} mm)'.format(name.upper(), d[m], ds))
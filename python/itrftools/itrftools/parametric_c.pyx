@@ -0,0 +1,75 @@
+# cython: boundscheck=False, wraparound=False, language_level=3
+""" C (Cython) versions of the parametric models, see parametric.py; used
+    (when built) by parametric() and by the vectorized models if numba is not
+    available. The (scalar) model functions follow the error contract of the
+    pure Python models, i.e. raise ZeroDivisionError, ValueError (math domain
+    error) and OverflowError (math range error) where math.log1p() and
+    math.expm1() would. The kernels follow the conventions of the numba
+    kernels in _fused_kernels.py, i.e. take the reciprocals of the relaxation
+    times and write to a preallocated output array; like the NumPy versions,
+    they return nan/inf instead of raising.
+"""
+
+from cython cimport floating
+from libc.math cimport log1p, expm1, isinf
+
+cdef inline double _log1p(double x) except? -1:
+  """ log1p() raising ValueError like math.log1p() """
+  if x <= -1e0:
+    raise ValueError('math domain error')
+  return log1p(x)
+
+cdef inline double _expm1(double x) except? -1:
+  """ expm1() raising OverflowError like math.expm1() """
+  cdef double r = expm1(x)
+  if isinf(r) and not isinf(x):
+    raise OverflowError('math range error')
+  return r
+
+cpdef double md_log_c(double dtq, double a1, double t1) except? -1:
+  """ C version of md_log() """
+  return a1*_log1p(dtq/t1)
+
+cpdef double md_exp_c(double dtq, double a1, double t1) except? -1:
+  """ C version of md_exp() """
+  return -a1*_expm1(-dtq/t1)
+
+cpdef double md_logexp_c(double dtq, double a1, double t1, double a2,
+                         double t2) except? -1:
+  """ C version of md_logexp() """
+  return a1*_log1p(dtq/t1) - a2*_expm1(-dtq/t2)
+
+cpdef double md_expexp_c(double dtq, double a1, double t1, double a2,
+                         double t2) except? -1:
+  """ C version of md_expexp() """
+  return -a1*_expm1(-dtq/t1) - a2*_expm1(-dtq/t2)
+
+def logexp_kernel(const floating[::1] dtq, const floating[::1] a1,
+                  const floating[::1] inv_t1, const floating[::1] a2,
+                  const floating[::1] inv_t2, floating[::1] out):
+  cdef Py_ssize_t i
+  with nogil:
+    for i in range(dtq.shape[0]):
+      out[i] = a1[i]*log1p(dtq[i]*inv_t1[i]) - a2[i]*expm1(-dtq[i]*inv_t2[i])
+
+def logexp_kernel_s(const floating[::1] dtq, floating a1, floating inv_t1,
+                    floating a2, floating inv_t2, floating[::1] out):
+  cdef Py_ssize_t i
+  with nogil:
+    for i in range(dtq.shape[0]):
+      out[i] = a1*log1p(dtq[i]*inv_t1) - a2*expm1(-dtq[i]*inv_t2)
+
+def expexp_kernel(const floating[::1] dtq, const floating[::1] a1,
+                  const floating[::1] inv_t1, const floating[::1] a2,
+                  const floating[::1] inv_t2, floating[::1] out):
+  cdef Py_ssize_t i
+  with nogil:
+    for i in range(dtq.shape[0]):
+      out[i] = -a1[i]*expm1(-dtq[i]*inv_t1[i]) - a2[i]*expm1(-dtq[i]*inv_t2[i])
+
+def expexp_kernel_s(const floating[::1] dtq, floating a1, floating inv_t1,
+                    floating a2, floating inv_t2, floating[::1] out):
+  cdef Py_ssize_t i
+  with nogil:
+    for i in range(dtq.shape[0]):
+      out[i] = -a1*expm1(-dtq[i]*inv_t1) - a2*expm1(-dtq[i]*inv_t2)
@@ -1,4 +1,18 @@
-from setuptools import setup
+import os
+from setuptools import setup, Extension
+
+## The C (Cython) version of the parametric models is optional; it is only
+## built if Cython is available, and a failure to build it (e.g. with no
+## working C compiler) only issues a warning, leaving the pure Python models.
+try:
+  from Cython.Build import cythonize
+  ext_modules = cythonize(
+    [Extension('itrftools.parametric_c', ['itrftools/parametric_c.pyx'],
+               extra_compile_args=[] if os.name == 'nt' else ['-O3'])])
+  # set here, since cythonize() does not copy it over
+  for ext in ext_modules: ext.optional = True
+except ImportError:
+  ext_modules = []
 
 setup(name='itrftools',
       version='0.1',
@@ -9,4 +23,6 @@ setup(name='itrftools',
       license='FY',
       packages=['itrftools'],
       scripts=['bin/itrftool'],
-      install_requires=['numpy'])
+      ext_modules=ext_modules,
+      install_requires=['numpy'],
+      extras_require={'jit': ['numba']})